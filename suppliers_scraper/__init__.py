@@ -0,0 +1 @@
+"""Shared building blocks for the CCS supplier and Find a Tender award scrapers."""
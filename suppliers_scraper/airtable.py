@@ -0,0 +1,277 @@
+"""Airtable tables and uploaders for both datasets."""
+from pyairtable import Api
+from requests import HTTPError
+
+from . import config
+from .mirror import AIRTABLE_HOST, AirtableMirror
+from .ratelimit import get_limiter
+
+# Fields each uploader writes, and which of them identify a record
+FRAMEWORK_FIELDS = ['Company', 'Framework / Contract', 'Reference', 'Status', 'Trading as']
+FRAMEWORK_KEY_FIELDS = ['Company', 'Reference', 'Framework / Contract']
+AWARD_FIELDS = [
+    'OCID', 'Release_ID', 'Title', 'Description', 'Buyer_Name', 'Currency',
+    'Release_Date', 'Award_Date', 'Contract_Start_Date', 'Contract_End_Date',
+    'Contract_Value', 'Award_Status', 'Supplier_Name', 'CPV_Codes',
+    'CPV_Descriptions', 'Notice_URL',
+]
+AWARD_KEY_FIELDS = ['OCID', 'Release_ID', 'Supplier_Name', 'Award_Date']
+
+# Statuses Airtable answers with when a record id in the request doesn't exist
+NOT_FOUND_STATUSES = {404, 422}
+
+
+def get_table(table_id):
+    api = Api(config.AIRTABLE_ACCESS_TOKEN)
+    return api.table(config.AIRTABLE_BASE_ID, table_id)
+
+
+def rate_limited(func, *args, **kwargs):
+    """Call a single-request pyairtable method through the api.airtable.com limiter."""
+    limiter = get_limiter(AIRTABLE_HOST)
+    limiter.wait()
+    try:
+        result = func(*args, **kwargs)
+    except HTTPError as e:
+        if e.response is not None:
+            limiter.record(e.response.status_code, e.response.headers.get("Retry-After"))
+        raise
+    limiter.on_success()
+    return result
+
+
+def get_frameworks_table():
+    return get_table(config.SUPPLIERS_FRAMEWORKS_TABLE_ID)
+
+
+def get_awards_table():
+    return get_table(config.TENDER_AWARD_TABLE_ID)
+
+
+def frameworks_mirror(table):
+    return AirtableMirror(table, "frameworks", FRAMEWORK_KEY_FIELDS, FRAMEWORK_FIELDS)
+
+
+def awards_mirror(table):
+    return AirtableMirror(table, "awards", AWARD_KEY_FIELDS, AWARD_FIELDS)
+
+
+def _write_batches(method, items, mirror, label, batch_size=10):
+    """Run batch_create/batch_update 10 at a time.
+
+    Returns (written, failed) where `failed` lists the positions in `items`
+    of every record in a batch that errored.
+    """
+    written, failed = 0, []
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        try:
+            # Use typecast=True to allow new values for select fields
+            result = rate_limited(method, batch, typecast=True)
+            mirror.apply(result)
+            written += len(result)
+            print(f"{label} batch {i//batch_size + 1}: {written}/{len(items)} records")
+        except Exception as e:
+            print(f"Error in {label.lower()} batch {i//batch_size + 1}: {e}")
+            failed.extend(range(i, i + len(batch)))
+    return written, failed
+
+
+def _status_code(error):
+    response = getattr(error, "response", None)
+    return response.status_code if response is not None else None
+
+
+def _is_deleted(table, airtable_id):
+    """True if the record is gone from Airtable (as opposed to rejecting our fields)."""
+    try:
+        rate_limited(table.get, airtable_id)
+    except Exception as e:
+        return _status_code(e) == 404
+    return False
+
+
+def _retry_updates(table, mirror, to_update, positions):
+    """Retry records from failed update batches one at a time.
+
+    A record deleted in Airtable since the mirror last saw it fails its whole
+    batch of 10; alone, the other records go through. Returns (written,
+    failed, deleted), where `deleted` lists positions in `to_update` whose
+    Airtable record no longer exists.
+    """
+    written, failed, deleted = 0, [], []
+    for p in positions:
+        item = to_update[p]
+        try:
+            mirror.apply([rate_limited(table.update, item["id"], item["fields"], typecast=True)])
+            written += 1
+        except Exception as e:
+            if _status_code(e) in NOT_FOUND_STATUSES and _is_deleted(table, item["id"]):
+                deleted.append(p)
+            else:
+                print(f"Error updating record {item['id']}: {e}")
+                failed.append(p)
+    if positions:
+        print(f"Retried {len(positions)} updates singly: {written} written, "
+              f"{len(deleted)} deleted in Airtable, {len(failed)} failed")
+    return written, failed, deleted
+
+
+def sync_records(table, mirror, records, full_refresh=False, failed_indices=None,
+                 assign_record_ids=False):
+    """Create new records and update changed ones, using the mirror for the diff.
+
+    Records whose key and fields already match Airtable are skipped without
+    a request; records sharing a key are only written once. Updates to
+    records that were deleted in Airtable are re-sent as creates. With
+    `assign_record_ids`, new records get the next 'Record ID' numbers from
+    the mirror. Returns (uploaded, failed). If `failed_indices` is a list it
+    receives the positions in `records` of every record that wasn't written.
+    """
+    mirror.refresh(full=full_refresh)
+
+    to_create, to_update, unchanged = [], [], 0
+    create_sources, update_sources = [], []  # positions in `records` behind each payload
+    pending_creates, pending_updates = {}, {}
+    for i, fields in enumerate(records):
+        airtable_id, same = mirror.lookup(fields)
+        if airtable_id is None:
+            key = mirror.key(fields)
+            if key in pending_creates:  # duplicate within this upload
+                create_sources[pending_creates[key]].append(i)
+                continue
+            pending_creates[key] = len(to_create)
+            to_create.append(fields)
+            create_sources.append([i])
+        elif same:
+            unchanged += 1
+        elif airtable_id in pending_updates:  # duplicate within this upload
+            update_sources[pending_updates[airtable_id]].append(i)
+        else:
+            pending_updates[airtable_id] = len(to_update)
+            to_update.append({"id": airtable_id, "fields": fields})
+            update_sources.append([i])
+
+    print(f"{len(to_create)} new, {len(to_update)} changed, {unchanged} unchanged records")
+    updated, update_failed = _write_batches(table.batch_update, to_update, mirror, "Updated")
+    retried, update_failed, deleted = _retry_updates(table, mirror, to_update, update_failed)
+    updated += retried
+    # Records deleted in Airtable since the mirror last saw them are created again
+    for p in deleted:
+        mirror.forget(to_update[p]["id"])
+        fields = to_update[p]["fields"]
+        key = mirror.key(fields)
+        if key in pending_creates:
+            create_sources[pending_creates[key]].extend(update_sources[p])
+        else:
+            pending_creates[key] = len(to_create)
+            to_create.append(fields)
+            create_sources.append(update_sources[p])
+
+    if assign_record_ids:
+        next_id = mirror.next_record_id()
+        to_create = [{**fields, "Record ID": next_id + n} for n, fields in enumerate(to_create)]
+
+    created, create_failed = _write_batches(table.batch_create, to_create, mirror, "Created")
+    mirror.save()
+
+    if failed_indices is not None:
+        failed_indices.extend(i for p in create_failed for i in create_sources[p])
+        failed_indices.extend(i for p in update_failed for i in update_sources[p])
+    return created + updated, len(create_failed) + len(update_failed)
+
+
+def upload_frameworks(df, table, mirror=None, full_refresh=False, failed_indices=None):
+    """Upload DataFrame to Airtable with auto-incrementing Record ID."""
+    print(f"Uploading {len(df)} records to Airtable...")
+    mirror = mirror or frameworks_mirror(table)
+
+    # Prepare records for batch upload
+    records_to_upload = []
+    for index, row in df.iterrows():
+        record = {
+            'Company': row['Company'],
+            'Framework / Contract': row['Framework / Contract'],
+            'Reference': row['Reference'],
+            'Status': row['Status'],
+            'Trading as': row['Trading as']
+        }
+        records_to_upload.append(record)
+
+    total_uploaded, failed = sync_records(table, mirror, records_to_upload, full_refresh, failed_indices,
+                                          assign_record_ids=True)
+    print(f"Successfully uploaded {total_uploaded} records to Airtable")
+    return total_uploaded, failed
+
+
+def format_for_airtable(record):
+    """Format an award record for Airtable upload"""
+    airtable_record = {}
+
+    # Handle text fields
+    text_fields = ['OCID', 'Release_ID', 'Title', 'Description', 'Buyer_Name', 'Currency']
+    for field in text_fields:
+        if record.get(field):
+            airtable_record[field] = str(record[field])
+
+    # Handle date fields
+    date_fields = ['Release_Date', 'Award_Date', 'Contract_Start_Date', 'Contract_End_Date']
+    for field in date_fields:
+        if record.get(field):
+            airtable_record[field] = record[field]
+
+    # Handle currency field
+    if record.get('Contract_Value') is not None:
+        airtable_record['Contract_Value'] = float(record['Contract_Value'])
+
+    # Handle single select fields
+    if record.get('Buyer_Name'):
+        airtable_record['Buyer_Name'] = record['Buyer_Name']
+    if record.get('Award_Status'):
+        airtable_record['Award_Status'] = record['Award_Status']
+
+    # Handle multi-select fields (convert semicolon-separated to list)
+    if record.get('Supplier_Name'):
+        suppliers = [s.strip() for s in record['Supplier_Name'].split(';') if s.strip()]
+        airtable_record['Supplier_Name'] = suppliers
+
+    if record.get('CPV_Codes'):
+        codes = [c.strip() for c in record['CPV_Codes'].split(';') if c.strip()]
+        airtable_record['CPV_Codes'] = codes
+
+    if record.get('CPV_Descriptions'):
+        descriptions = [d.strip() for d in record['CPV_Descriptions'].split(';') if d.strip()]
+        airtable_record['CPV_Descriptions'] = descriptions
+
+    # Handle URL field
+    if record.get('Notice_URL'):
+        airtable_record['Notice_URL'] = record['Notice_URL']
+
+    return airtable_record
+
+
+def upload_awards(records, table, mirror=None, full_refresh=False, failed_indices=None):
+    """Upload award records to Airtable in batches
+
+    `failed_indices`, if given, receives the positions in `records` of the
+    records that could not be written.
+    """
+    print(f"Uploading {len(records)} records to Airtable...")
+    mirror = mirror or awards_mirror(table)
+
+    # Format records for Airtable
+    airtable_records, sources = [], []
+    for i, record in enumerate(records):
+        formatted_record = format_for_airtable(record)
+        if formatted_record:  # Only add non-empty records
+            airtable_records.append(formatted_record)
+            sources.append(i)
+
+    print(f"Formatted {len(airtable_records)} records for upload")
+
+    failed_positions = []
+    uploaded_count, failed_count = sync_records(table, mirror, airtable_records, full_refresh, failed_positions)
+    if failed_indices is not None:
+        failed_indices.extend(sources[p] for p in failed_positions)
+    print(f"Upload complete: {uploaded_count} successful, {failed_count} failed")
+    return uploaded_count, failed_count
@@ -0,0 +1,375 @@
+"""Find a Tender OCDS award releases: fetching, flattening and export."""
+from datetime import datetime, timedelta
+
+from . import config
+from .client import get_session
+from .parallel import map_chunks
+
+# Configuration
+BASE_URL = "https://www.find-tender.service.gov.uk/api/1.0/ocdsReleasePackages"
+BATCH_SIZE = 100
+RELEASE_CHUNK_SIZE = 250  # releases per process-pool work unit
+TIMEOUT = config.TIMEOUT
+
+XLSX_PATH = "award_contracts.xlsx"
+
+TARGET_CPV_CODES = {
+    '48000000', '48100000', '48200000', '48300000', '48400000',
+    '48500000', '48600000', '48700000', '48800000', '48900000',
+    '72000000', '72100000', '72200000', '72300000', '72400000',
+    '72500000', '72600000', '72700000', '72800000', '72900000'
+}
+
+
+def generate_weekly_chunks(years=2):
+    """Generate weekly date chunks for the past `years` years"""
+    end_date = datetime.now()
+    start_date = end_date - timedelta(days=years*365)
+
+    chunks = []
+    current = start_date
+
+    while current < end_date:
+        week_end = min(current + timedelta(days=7), end_date)
+        chunks.append((
+            current.strftime("%Y-%m-%dT00:00:00"),
+            week_end.strftime("%Y-%m-%dT23:59:59")
+        ))
+        current = week_end
+
+    return chunks
+
+
+def fetch_award_batch(cursor=None, limit=100, start_date=None, end_date=None):
+    """Fetch batch of award stage releases"""
+    params = {
+        "stages": "award",
+        "limit": limit
+    }
+    if start_date:
+        params["updatedFrom"] = start_date
+    if end_date:
+        params["updatedTo"] = end_date
+    if cursor:
+        params["cursor"] = cursor
+
+    response = get_session().get(BASE_URL, params=params, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def parse_date(date_string):
+    """Parse date string to YYYY-MM-DD format"""
+    if not date_string:
+        return None
+    try:
+        return datetime.fromisoformat(date_string.replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except Exception:
+        return date_string
+
+
+def extract_cpv_info(tender):
+    """Extract CPV codes and descriptions from tender"""
+    cpv_codes = []
+    cpv_descriptions = []
+
+    # Main classification
+    main_cpv = tender.get("classification", {})
+    if main_cpv.get('scheme') == 'CPV':
+        cpv_codes.append(main_cpv.get('id', ''))
+        cpv_descriptions.append(main_cpv.get('description', ''))
+
+    # Additional classifications from items
+    items = tender.get('items', [])
+    for item in items:
+        for ac in item.get('additionalClassifications', []):
+            if ac.get('scheme') == 'CPV':
+                cpv_codes.append(ac.get('id', ''))
+                cpv_descriptions.append(ac.get('description', ''))
+
+    # Remove duplicates and empty values
+    cpv_codes = list(filter(None, dict.fromkeys(cpv_codes)))
+    cpv_descriptions = list(filter(None, dict.fromkeys(cpv_descriptions)))
+
+    return '; '.join(cpv_codes), '; '.join(cpv_descriptions)
+
+
+def extract_award_records(release):
+    """Extract award records from a release"""
+    ocid = release.get('ocid', '')
+    release_id = release.get('id', '')
+    release_date = parse_date(release.get('date'))
+
+    tender = release.get('tender', {})
+    tender_title = tender.get('title', '')
+    tender_description = tender.get('description', '')
+
+    buyer = release.get('buyer', {})
+    buyer_name = buyer.get('name', '')
+
+    awards = release.get('awards', [])
+    contracts = release.get('contracts', [])
+
+    # Create contract lookup by award ID
+    contract_lookup = {}
+    for contract in contracts:
+        award_id = contract.get('awardID', '')
+        if award_id:
+            contract_lookup[award_id] = contract
+
+    records = []
+
+    if not awards:
+        # No awards - create single record with tender info
+        cpv_codes, cpv_descriptions = extract_cpv_info(tender)
+        records.append({
+            'OCID': ocid,
+            'Release_ID': release_id,
+            'Release_Date': release_date,
+            'Title': tender_title,
+            'Description': tender_description,
+            'Buyer_Name': buyer_name,
+            'Award_Date': None,
+            'Supplier_Name': None,
+            'Contract_Value': None,
+            'Currency': None,
+            'Contract_Start_Date': None,
+            'Contract_End_Date': None,
+            'Award_Status': None,
+            'CPV_Codes': cpv_codes,
+            'CPV_Descriptions': cpv_descriptions,
+            'Notice_URL': f"https://www.find-tender.service.gov.uk/Notice/{release_id}" if release_id else ''
+        })
+    else:
+        # Process each award
+        for award in awards:
+            award_id = award.get('id', '')
+            award_date = parse_date(award.get('date'))
+            award_status = award.get('status', '')
+
+            # Get contract info
+            contract = contract_lookup.get(award_id, {})
+            contract_value = None
+            currency = ''
+            contract_start = None
+            contract_end = None
+
+            # Contract value and currency
+            value_info = contract.get('value', {})
+            if value_info:
+                contract_value = value_info.get('amount')
+                currency = value_info.get('currency', '')
+
+            # Use contract signing date as award date if award date is missing
+            if not award_date:
+                award_date = parse_date(contract.get('dateSigned'))
+
+            # Contract period
+            contract_period = contract.get('period', {})
+            if contract_period:
+                contract_start = parse_date(contract_period.get('startDate'))
+                contract_end = parse_date(contract_period.get('endDate'))
+
+            # If no contract period, try award period
+            if not contract_start and not contract_end:
+                award_period = award.get('contractPeriod', {})
+                if award_period:
+                    contract_start = parse_date(award_period.get('startDate'))
+                    contract_end = parse_date(award_period.get('endDate'))
+
+            # Suppliers
+            suppliers = award.get('suppliers', [])
+            supplier_names = [s.get('name', '') for s in suppliers if s.get('name')]
+            supplier_name = '; '.join(supplier_names) if supplier_names else ''
+
+            # CPV info
+            cpv_codes, cpv_descriptions = extract_cpv_info(tender)
+
+            record = {
+                'OCID': ocid,
+                'Release_ID': release_id,
+                'Release_Date': release_date,
+                'Title': tender_title,
+                'Description': tender_description,
+                'Buyer_Name': buyer_name,
+                'Award_Date': award_date,
+                'Supplier_Name': supplier_name,
+                'Contract_Value': contract_value,
+                'Currency': currency,
+                'Contract_Start_Date': contract_start,
+                'Contract_End_Date': contract_end,
+                'Award_Status': award_status,
+                'CPV_Codes': cpv_codes,
+                'CPV_Descriptions': cpv_descriptions,
+                'Notice_URL': f"https://www.find-tender.service.gov.uk/Notice/{release_id}" if release_id else ''
+            }
+
+            records.append(record)
+
+    return records
+
+
+def should_include_record(record):
+    """Check if record contains any of the target CPV codes"""
+    cpv_codes = record.get('CPV_Codes', '')
+    if not cpv_codes:
+        return False
+
+    # Split the semicolon-separated CPV codes and check each one
+    record_cpv_codes = [code.strip() for code in cpv_codes.split(';') if code.strip()]
+
+    # Check if any of the record's CPV codes match our target codes
+    for code in record_cpv_codes:
+        if code in TARGET_CPV_CODES:
+            return True
+
+    return False
+
+
+def fetch_releases(weekly_chunks):
+    """Page through every week's award releases and return them all"""
+    print(f"Total weeks to process: {len(weekly_chunks)}")
+
+    all_releases = []
+    total_batch_count = 0
+
+    # Process each week
+    for week_num, (week_start, week_end) in enumerate(weekly_chunks, 1):
+        print(f"\n--- Processing Week {week_num}/{len(weekly_chunks)} ---")
+        print(f"Date range: {week_start[:10]} to {week_end[:10]}")
+
+        cursor = None
+        week_batch_count = 0
+        week_releases = 0
+
+        # Paginate through this week's data
+        while True:
+            try:
+                data = fetch_award_batch(
+                    cursor=cursor,
+                    limit=BATCH_SIZE,
+                    start_date=week_start,
+                    end_date=week_end
+                )
+
+                releases = data.get("releases", [])
+
+                if not releases:
+                    break
+
+                all_releases.extend(releases)
+                week_batch_count += 1
+                total_batch_count += 1
+                week_releases += len(releases)
+
+                print(f"  Batch {week_batch_count}: Fetched {len(releases)} releases")
+
+                cursor = data.get("next")
+                if not cursor:
+                    break
+
+            except Exception as e:
+                print(f"  Error fetching data for week {week_num}: {e}")
+                break
+
+        print(f"Week {week_num} complete: {week_releases} releases")
+        print(f"Running total: {len(all_releases)} releases")
+
+    print(f"\nAll weeks processed!")
+    print(f"Total releases fetched: {len(all_releases)}")
+    print(f"Total API calls made: {total_batch_count}")
+    return all_releases
+
+
+def release_key(release):
+    """Fingerprint key and value for a release: (OCID|release id, release date)"""
+    return f"{release.get('ocid', '')}|{release.get('id', '')}", release.get('date') or ''
+
+
+def extract_release_batch(releases):
+    """Process-pool worker: (key, fingerprint, filtered records) per release"""
+    results = []
+    for release in releases:
+        key, fingerprint = release_key(release)
+        try:
+            records = [record for record in extract_award_records(release) if should_include_record(record)]
+        except Exception as e:
+            print(f"Error processing release {release.get('id', 'unknown')}: {e}")
+            records = None
+        results.append((key, fingerprint, records))
+    return results
+
+
+def process_releases(all_releases, fingerprints=None, workers=None):
+    """Flatten releases into CPV-filtered award records.
+
+    Returns (filtered_records, changed_records). With a FingerprintStore,
+    releases whose (ocid, id, date) were seen on a previous run are not
+    re-extracted: their cached records go into `filtered_records` only, so
+    `changed_records` holds just new or updated ones. The remaining releases
+    are flattened in chunks across `workers` processes. Both lists keep the
+    order of `all_releases`.
+    """
+    print("Processing releases...")
+    changed_records = []
+
+    # One slot per release, so cached and freshly processed records are
+    # merged back in input order
+    slots = []
+    pending, pending_slots = [], []
+    for release in all_releases:
+        if fingerprints is not None:
+            cached = fingerprints.lookup(*release_key(release))
+            if cached is not None:
+                slots.append(cached)
+                continue
+        pending_slots.append(len(slots))
+        slots.append(None)
+        pending.append(release)
+
+    if fingerprints is not None:
+        print(f"Skipped {fingerprints.skipped} unchanged releases, {len(pending)} to process")
+
+    results = map_chunks(extract_release_batch, pending, workers=workers, chunk_size=RELEASE_CHUNK_SIZE)
+    processed = 0
+    for i, (slot, (key, fingerprint, records)) in enumerate(zip(pending_slots, results), 1):
+        if records is not None:
+            slots[slot] = records
+            processed += len(records)
+            changed_records.extend(records)
+            if fingerprints is not None:
+                fingerprints.remember(key, fingerprint, records)
+
+        if i % 500 == 0:
+            print(f"Processed {i}/{len(pending)} releases, {processed} filtered records")
+
+    filtered_records = [record for records in slots if records for record in records]
+    print(f"Finished processing. Filtered records: {len(filtered_records)}, Changed: {len(changed_records)}")
+    return filtered_records, changed_records
+
+
+def save_award_contracts(filtered_records, filename=XLSX_PATH):
+    """Stream records to .xlsx/.csv/.parquet sorted by award date (newest first)"""
+    from .export import write_sorted
+
+    filled = write_sorted(filtered_records, filename)
+
+    print(f"Data saved to {filename}")
+    print(f"Records with contract values: {filled.get('Contract_Value', 0)}")
+    print(f"Records with award dates: {filled.get('Award_Date', 0)}")
+    print(f"Records with suppliers: {filled.get('Supplier_Name', 0)}")
+    return filled
+
+
+def load_award_contracts(filename=XLSX_PATH):
+    """Read a saved award export back into a list of record dicts"""
+    import pandas as pd
+
+    if filename.endswith('.csv'):
+        df = pd.read_csv(filename, dtype={'CPV_Codes': str})
+    elif filename.endswith('.parquet'):
+        df = pd.read_parquet(filename)
+    else:
+        df = pd.read_excel(filename, sheet_name='Award Contracts', dtype={'CPV_Codes': str})
+    # NaN is truthy, so turn blanks back into None before formatting for Airtable
+    return df.astype(object).where(df.notna(), None).to_dict('records')
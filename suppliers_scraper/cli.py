@@ -0,0 +1,262 @@
+"""`suppliers-scraper` command line entry point.
+
+Runs the scrapers headless, without marimo or the page-count exploration
+cells. Each sub-command imports only the modules it needs so start-up stays
+fast for cron runs.
+"""
+import argparse
+
+
+def cmd_scrape_frameworks(args):
+    import pandas as pd
+
+    from .fingerprints import FingerprintStore
+    from .frameworks import save_frameworks, scrape_frameworks
+    from .history import record_snapshot
+
+    fingerprints = FingerprintStore("frameworks", reset=args.full)
+    rows, changed = scrape_frameworks(fingerprints=fingerprints, workers=args.workers)
+    save_frameworks(pd.DataFrame(rows), csv_path=args.csv, xlsx_path=args.xlsx)
+    record_snapshot(rows)
+
+    if args.enrich:
+        from .enrich import enrich_suppliers, save_supplier_details
+
+        # A complete scrape, so suppliers that left the listing can leave the cache
+        save_supplier_details(enrich_suppliers(rows, workers=args.enrich_workers, prune=True))
+
+    if args.upload and changed:
+        from .airtable import get_frameworks_table, upload_frameworks
+
+        failed_rows = []
+        upload_frameworks(pd.DataFrame(changed), get_frameworks_table(),
+                          full_refresh=args.full_mirror, failed_indices=failed_rows)
+        # Suppliers whose rows didn't reach Airtable stay "changed" for the next run
+        fingerprints.forget_rows([changed[i] for i in failed_rows])
+    elif args.upload:
+        print("No supplier changes since the last run, nothing to upload")
+    else:
+        # Nothing went to Airtable, so only unchanged suppliers count as seen
+        fingerprints.forget_changed()
+
+    fingerprints.save()
+
+
+def cmd_sync_awards(args):
+    from .awards import fetch_releases, generate_weekly_chunks, process_releases, save_award_contracts
+    from .fingerprints import FingerprintStore
+
+    print("Fetching award data from Find a Tender API...")
+    print(f"Generating weekly chunks for the past {args.years} years...")
+    all_releases = fetch_releases(generate_weekly_chunks(years=args.years))
+
+    fingerprints = FingerprintStore("awards", reset=args.full)
+    filtered_records, changed_records = process_releases(all_releases, fingerprints, workers=args.workers)
+
+    if not filtered_records:
+        print("No data to save.")
+        return
+
+    save_award_contracts(filtered_records, filename=args.output)
+
+    if args.upload and changed_records:
+        from .airtable import get_awards_table, upload_awards
+
+        failed_rows = []
+        uploaded, failed = upload_awards(changed_records, get_awards_table(),
+                                         full_refresh=args.full_mirror, failed_indices=failed_rows)
+        print(f"\nAirtable upload summary:")
+        print(f"- Successfully uploaded: {uploaded} records")
+        print(f"- Failed uploads: {failed} records")
+        # Releases whose records didn't reach Airtable stay "changed" for the next run
+        fingerprints.forget_rows([changed_records[i] for i in failed_rows])
+    elif args.upload:
+        print("No new or updated awards since the last run, nothing to upload")
+    else:
+        fingerprints.forget_changed()
+
+    # Every run re-fetches the whole --years window, so releases that fell out
+    # of it are dropped here and the store stays bounded
+    fingerprints.save()
+
+
+def cmd_upload(args):
+    if args.dataset == "frameworks":
+        import pandas as pd
+
+        from .airtable import get_frameworks_table, upload_frameworks
+        from .frameworks import CSV_PATH
+
+        df = pd.read_csv(args.path or CSV_PATH, keep_default_na=False)
+        upload_frameworks(df, get_frameworks_table(), full_refresh=args.full_mirror)
+    else:
+        from .airtable import get_awards_table, upload_awards
+        from .awards import XLSX_PATH, load_award_contracts
+
+        upload_awards(load_award_contracts(args.path or XLSX_PATH), get_awards_table(),
+                      full_refresh=args.full_mirror)
+
+
+def cmd_enrich(args):
+    import csv
+
+    from .enrich import enrich_suppliers, save_supplier_details
+
+    with open(args.frameworks, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    details = enrich_suppliers(rows, workers=args.workers, refresh=args.refresh)
+    save_supplier_details(details, path=args.output)
+
+
+def cmd_history(args):
+    from .history import iter_events
+
+    count = 0
+    for e in iter_events(reference=args.reference, company=args.company, event=args.event,
+                         since=args.since, until=args.until):
+        change = f"{e['previous_status']} -> {e['status']}" if e["previous_status"] else e["status"]
+        print(f"{e['date']}  {e['event']:<14}  {e['reference'] or '-':<10}  {e['company']}  ({change})")
+        count += 1
+    print(f"{count} events")
+
+
+def cmd_index(args):
+    import csv
+    from pathlib import Path
+
+    from .awards import load_award_contracts
+    from .search import build_index
+
+    framework_rows, award_records = [], []
+    if Path(args.frameworks).exists():
+        with open(args.frameworks, newline="", encoding="utf-8") as f:
+            framework_rows = list(csv.DictReader(f))
+    else:
+        print(f"{args.frameworks} not found, indexing no suppliers")
+    if Path(args.awards).exists():
+        award_records = load_award_contracts(args.awards)
+    else:
+        print(f"{args.awards} not found, indexing no awards")
+
+    build_index(framework_rows, award_records)
+
+
+def cmd_search(args):
+    import sqlite3
+
+    from .search import plain_terms, search_awards, search_suppliers
+
+    text = args.text if args.fts or not args.text else plain_terms(args.text)
+    try:
+        if args.dataset == "suppliers":
+            rows = search_suppliers(text=text, reference=args.reference, status=args.status, limit=args.limit)
+        else:
+            rows = search_awards(text=text, reference=args.reference, cpv_prefixes=args.cpv,
+                                 min_value=args.min_value, max_value=args.max_value,
+                                 since=args.since, until=args.until, limit=args.limit)
+    except sqlite3.OperationalError as e:
+        if not str(e).startswith("fts5:"):
+            raise
+        raise SystemExit(f"Invalid --fts query {args.text!r} ({e}); drop --fts to search for the words as typed")
+
+    if args.dataset == "suppliers":
+        for r in rows:
+            print(f"{r['reference'] or '-':<10}  {r['status']:<8}  {r['company']}  —  {r['framework']}")
+    else:
+        for r in rows:
+            value = f"{r['contract_value']:,.0f} {r['currency'] or ''}" if r["contract_value"] is not None else "-"
+            print(f"{r['award_date'] or '-':<10}  {value:>16}  {r['supplier_name'] or '-'}  —  {r['title']}")
+    print(f"{len(rows)} results")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="suppliers-scraper",
+        description="Scrape CCS supplier frameworks and Find a Tender awards.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape = commands.add_parser("scrape-frameworks", help="scrape the CCS supplier search")
+    scrape.add_argument("--csv", default="ccs_suppliers_frameworks.csv")
+    scrape.add_argument("--xlsx", default="ccs_suppliers_frameworks.xlsx")
+    scrape.add_argument("--no-upload", dest="upload", action="store_false",
+                        help="only write the CSV/XLSX files")
+    scrape.add_argument("--full", action="store_true",
+                        help="ignore fingerprints and treat every supplier as changed")
+    scrape.add_argument("--enrich", action="store_true",
+                        help="also fetch new/changed supplier detail pages into ccs_supplier_details.csv")
+    scrape.add_argument("--enrich-workers", type=int,
+                        help="concurrent detail page requests (default: SCRAPER_ENRICH_WORKERS or 8)")
+    scrape.add_argument("--workers", type=int,
+                        help="processes used to parse pages, 0 for one per core (default: SCRAPER_WORKERS or 1)")
+    scrape.set_defaults(func=cmd_scrape_frameworks)
+
+    awards = commands.add_parser("sync-awards", help="fetch Find a Tender award releases")
+    awards.add_argument("--years", type=int, default=2, help="how far back to fetch (default: 2)")
+    # --xlsx is the original name of this option, kept so existing cron lines still work
+    awards.add_argument("-o", "--output", "--xlsx", dest="output", default="award_contracts.xlsx",
+                        help="export file, .xlsx, .csv or .parquet (default: award_contracts.xlsx)")
+    awards.add_argument("--no-upload", dest="upload", action="store_false",
+                        help="only write the export file")
+    awards.add_argument("--full", action="store_true",
+                        help="ignore fingerprints and re-process every release")
+    awards.add_argument("--workers", type=int,
+                        help="processes used to flatten releases, 0 for one per core (default: SCRAPER_WORKERS or 1)")
+    awards.set_defaults(func=cmd_sync_awards)
+
+    upload = commands.add_parser("upload", help="upload a saved export to Airtable")
+    upload.add_argument("dataset", choices=["frameworks", "awards"])
+    upload.add_argument("--path", help="file to upload (defaults to the scraper's output file)")
+    upload.set_defaults(func=cmd_upload)
+
+    for command in (scrape, awards, upload):
+        command.add_argument("--full-mirror", action="store_true",
+                             help="re-read the whole Airtable table instead of only recently modified records")
+
+    enrich = commands.add_parser("enrich", help="fetch supplier detail pages for a saved scrape")
+    enrich.add_argument("--frameworks", default="ccs_suppliers_frameworks.csv")
+    enrich.add_argument("--output", default="ccs_supplier_details.csv")
+    enrich.add_argument("--workers", type=int,
+                        help="concurrent detail page requests (default: SCRAPER_ENRICH_WORKERS or 8)")
+    enrich.add_argument("--refresh", action="store_true",
+                        help="ignore the per-supplier cache and refetch every page")
+    enrich.set_defaults(func=cmd_enrich)
+
+    history = commands.add_parser("history", help="query supplier/framework status changes")
+    history.add_argument("--reference", help="framework reference, e.g. RM6263")
+    history.add_argument("--company", help="case-insensitive substring of the company name")
+    history.add_argument("--event", choices=["added", "status_changed", "removed"])
+    history.add_argument("--since", help="first date to include (YYYY-MM-DD)")
+    history.add_argument("--until", help="last date to include (YYYY-MM-DD)")
+    history.set_defaults(func=cmd_history)
+
+    index = commands.add_parser("index", help="rebuild the local search index from the saved exports")
+    index.add_argument("--frameworks", default="ccs_suppliers_frameworks.csv")
+    index.add_argument("--awards", default="award_contracts.xlsx")
+    index.set_defaults(func=cmd_index)
+
+    search = commands.add_parser("search", help="query the local search index")
+    search.add_argument("dataset", choices=["suppliers", "awards"])
+    search.add_argument("--text", help="words that must all appear (full-text)")
+    search.add_argument("--fts", action="store_true",
+                        help="treat --text as an SQLite FTS5 query (AND/OR/NOT, \"phrases\", prefix*)")
+    search.add_argument("--reference", help="framework reference; for awards, only suppliers on it")
+    search.add_argument("--status", choices=["Active", "Expired"], help="suppliers only")
+    search.add_argument("--cpv", action="append", help="CPV code prefix, repeatable (awards only)")
+    search.add_argument("--min-value", type=float, help="minimum contract value (awards only)")
+    search.add_argument("--max-value", type=float, help="maximum contract value (awards only)")
+    search.add_argument("--since", help="earliest award date YYYY-MM-DD (awards only)")
+    search.add_argument("--until", help="latest award date YYYY-MM-DD (awards only)")
+    search.add_argument("--limit", type=int, default=50)
+    search.set_defaults(func=cmd_search)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
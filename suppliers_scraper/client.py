@@ -0,0 +1,103 @@
+"""One pooled, keep-alive HTTP client shared by both scrapers."""
+from functools import cache
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+
+from . import config
+from .ratelimit import get_limiter
+
+
+class RateLimitedMixin:
+    """Send every request through its host's adaptive limiter, retrying 429/503.
+
+    Once MAX_RETRIES is used up the throttled response is raised as an HTTP
+    error (requests.HTTPError / httpx.HTTPStatusError), so callers never
+    parse a 429/503 error page as if it were data.
+    """
+
+    def request(self, method, url, *args, **kwargs):
+        limiter = get_limiter(urlsplit(str(url)).hostname)
+        for attempt in range(config.MAX_RETRIES + 1):
+            limiter.wait()
+            response = super().request(method, url, *args, **kwargs)
+            throttled = limiter.record(response.status_code, response.headers.get("Retry-After"))
+            if not throttled:
+                return response
+            if attempt == config.MAX_RETRIES:
+                print(f"Still throttled after {config.MAX_RETRIES} retries: {url}")
+                response.raise_for_status()
+            response.close()
+
+
+class RateLimitedSession(RateLimitedMixin, requests.Session):
+    pass
+
+
+def _default_headers():
+    # Built by urllib3, which only advertises br/zstd when it can decode them
+    return {"User-Agent": config.USER_AGENT, "Accept-Encoding": DEFAULT_ACCEPT_ENCODING}
+
+
+def _create_http2_client(pool_maxsize, timeout):
+    """HTTP/2 client via httpx, or None if httpx/h2 aren't installed."""
+    try:
+        import h2  # noqa: F401
+        import httpx
+    except ImportError:
+        print("HTTP/2 requested but httpx[http2] is not installed, using HTTP/1.1 pooling")
+        return None
+
+    class RateLimitedHTTP2Client(RateLimitedMixin, httpx.Client):
+        pass
+
+    limits = httpx.Limits(
+        max_connections=pool_maxsize,
+        max_keepalive_connections=pool_maxsize,
+    )
+    return RateLimitedHTTP2Client(
+        http2=True,
+        limits=limits,
+        timeout=timeout,
+        headers=_default_headers(),
+        follow_redirects=True,
+    )
+
+
+def create_session(
+    http2=None,
+    pool_connections=None,
+    pool_maxsize=None,
+    timeout=None,
+):
+    """Build a rate-limited client with pooled keep-alive connections.
+
+    Returns a ``requests.Session`` or, when HTTP/2 is enabled and available,
+    an ``httpx.Client``. Both expose ``get(url, params=, headers=, timeout=)``
+    and responses with ``text``, ``json()``, ``status_code`` and
+    ``raise_for_status()``, which is all the scrapers use.
+    """
+    http2 = config.HTTP2 if http2 is None else http2
+    pool_connections = pool_connections or config.POOL_CONNECTIONS
+    pool_maxsize = pool_maxsize or config.POOL_MAXSIZE
+    timeout = timeout or config.TIMEOUT
+
+    if http2:
+        client = _create_http2_client(pool_maxsize, timeout)
+        if client is not None:
+            return client
+
+    session = RateLimitedSession()
+    session.headers.update(_default_headers())
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@cache
+def get_session():
+    """Process-wide shared client, so every request reuses the same pool."""
+    return create_session()
@@ -0,0 +1,53 @@
+"""Settings shared by both scrapers, read from the environment / .env file."""
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name, default=False):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+# Airtable
+AIRTABLE_ACCESS_TOKEN = os.getenv("AIRTABLE_ACCESS_TOKEN")
+AIRTABLE_BASE_ID = os.getenv("AIRTABLE_BASE_ID")
+TENDER_AWARD_TABLE_ID = os.getenv("TENDER_AWARD_TABLE_ID")
+SUPPLIERS_FRAMEWORKS_TABLE_ID = os.getenv("SUPPLIERS_FRAMEWORKS_TABLE_ID")
+
+# HTTP client
+USER_AGENT = os.getenv("SCRAPER_USER_AGENT", "Mozilla/5.0 (compatible; supplier-scraper/1.0)")
+TIMEOUT = int(os.getenv("SCRAPER_TIMEOUT", "30"))
+HTTP2 = _env_bool("SCRAPER_HTTP2")  # needs `httpx[http2]`, falls back to requests otherwise
+POOL_CONNECTIONS = int(os.getenv("SCRAPER_POOL_CONNECTIONS", "4"))  # distinct hosts kept warm
+POOL_MAXSIZE = int(os.getenv("SCRAPER_POOL_MAXSIZE", "16"))  # keep-alive sockets per host, >= worker count
+
+# Local state kept between runs (fingerprints, history, caches)
+STATE_DIR = os.getenv("SCRAPER_STATE_DIR", ".scraper_state")
+
+# Processes used to parse pages/releases (0 = one per CPU core)
+WORKERS = int(os.getenv("SCRAPER_WORKERS", "1"))
+
+# Adaptive rate limits per host as (start, min, max) requests per second.
+# Override with e.g. SCRAPER_RATE_LIMITS="www.crowncommercial.gov.uk=1:0.2:4,api.airtable.com=5:1:5"
+DEFAULT_RATE_LIMIT = (2.0, 0.2, 10.0)
+HOST_RATE_LIMITS = {
+    "www.crowncommercial.gov.uk": (1.0, 0.2, 5.0),
+    "www.find-tender.service.gov.uk": (2.0, 0.2, 10.0),
+    "api.airtable.com": (5.0, 0.5, 5.0),  # Airtable allows 5 requests/s per base
+}
+for _item in filter(None, os.getenv("SCRAPER_RATE_LIMITS", "").split(",")):
+    _host, _limits = _item.split("=", 1)
+    HOST_RATE_LIMITS[_host.strip()] = tuple(float(v) for v in _limits.split(":"))
+
+MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", "5"))  # per request on 429/503
+
+# Concurrent requests when fetching supplier detail pages
+ENRICH_WORKERS = int(os.getenv("SCRAPER_ENRICH_WORKERS", "8"))
+
+# Re-read each whole Airtable table this often, to catch records deleted there
+MIRROR_FULL_REFRESH_DAYS = float(os.getenv("SCRAPER_MIRROR_FULL_REFRESH_DAYS", "7"))
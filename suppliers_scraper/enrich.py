@@ -0,0 +1,169 @@
+"""Enrich suppliers with details from their CCS supplier pages.
+
+Each supplier's detail page (contact, address, company number, lots) is
+fetched concurrently through the shared pooled client, which rate-limits
+per host. Results are cached per supplier URL together with a fingerprint
+of the supplier's framework set in the listing. A page is only fetched
+again when that set changes, so a daily run normally fetches just the
+suppliers that joined or changed frameworks.
+"""
+import csv
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from bs4 import BeautifulSoup
+
+from . import config
+from .client import get_session
+from .fingerprints import FingerprintStore, digest
+
+DETAILS_CSV_PATH = "ccs_supplier_details.csv"
+
+DETAIL_COLUMNS = [
+    "Company", "Trading as", "Supplier URL", "Company number",
+    "Contact", "Email", "Phone", "Address", "Lots",
+]
+
+COMPANY_NUMBER_RE = re.compile(r'Company (?:registration )?number\s*:?\s*([A-Z]{0,2}\d{6,8})', re.IGNORECASE)
+LOT_RE = re.compile(r'^Lot\s+\d+[a-z]?\b.*', re.IGNORECASE)
+
+
+def parse_supplier_detail(html):
+    """Pull what we can from a supplier detail page into a flat dict."""
+    soup = BeautifulSoup(html, "html.parser")
+    # The site header/footer carry CCS's own phone, email and address
+    soup = soup.find("main") or soup
+    details = {}
+
+    # Labelled values, as definition lists or two-column tables
+    labelled = {}
+    for dt in soup.find_all("dt"):
+        dd = dt.find_next_sibling("dd")
+        if dd:
+            labelled[dt.get_text(" ", strip=True).rstrip(":").lower()] = dd
+    for tr in soup.find_all("tr"):
+        cells = tr.find_all(["th", "td"])
+        if len(cells) == 2:
+            labelled[cells[0].get_text(" ", strip=True).rstrip(":").lower()] = cells[1]
+
+    # Specific labels first, so "Contact email"/"Contact telephone" aren't taken as the contact name
+    for label, cell in labelled.items():
+        value = cell.get_text(" ", strip=True)
+        if "company number" in label or "registration number" in label:
+            details.setdefault("Company number", value)
+        elif "email" in label:
+            details.setdefault("Email", value)
+        elif "phone" in label:
+            details.setdefault("Phone", value)
+        elif "address" in label:
+            details.setdefault("Address", ", ".join(cell.stripped_strings))
+        elif "contact" in label and "@" not in value:
+            details.setdefault("Contact", value)
+
+    text = soup.get_text("\n")
+    if "Company number" not in details:
+        match = COMPANY_NUMBER_RE.search(text)
+        if match:
+            details["Company number"] = match.group(1)
+
+    mailto = soup.select_one('a[href^="mailto:"]')
+    if mailto and "Email" not in details:
+        details["Email"] = mailto["href"][len("mailto:"):].split("?")[0]
+    tel = soup.select_one('a[href^="tel:"]')
+    if tel and "Phone" not in details:
+        details["Phone"] = tel["href"][len("tel:"):]
+    address = soup.find("address")
+    if address and "Address" not in details:
+        details["Address"] = ", ".join(address.stripped_strings)
+
+    lots = dict.fromkeys(
+        " ".join(line.split()) for line in text.split("\n") if LOT_RE.match(line.strip())
+    )
+    if lots:
+        details["Lots"] = "; ".join(lots)
+
+    return details
+
+
+def _suppliers(rows):
+    """Group framework rows by supplier URL: url -> (company, trading as, framework set).
+
+    Also returns the companies that have no detail link in the listing.
+    """
+    suppliers, unlinked = {}, set()
+    for row in rows:
+        if "Supplier URL" not in row:
+            raise ValueError("Framework rows have no 'Supplier URL' column, "
+                             "re-run `suppliers-scraper scrape-frameworks` to record supplier links")
+        url = row["Supplier URL"]
+        if not url:
+            unlinked.add(row["Company"])
+            continue
+        company, trading_as, frameworks = suppliers.setdefault(
+            url, (row["Company"], row["Trading as"], set())
+        )
+        frameworks.add(row["Reference"] or row["Framework / Contract"])
+    return suppliers, unlinked
+
+
+def _fetch_detail(session, url):
+    resp = session.get(url, timeout=config.TIMEOUT)
+    resp.raise_for_status()
+    return parse_supplier_detail(resp.text)
+
+
+def enrich_suppliers(rows, workers=None, session=None, refresh=False, prune=False):
+    """Return one details dict per supplier, fetching only new/changed ones.
+
+    Cached suppliers missing from `rows` are kept unless `prune` is set,
+    which callers should only do when `rows` is the full listing.
+    """
+    session = session or get_session()
+    workers = workers or config.ENRICH_WORKERS
+    cache = FingerprintStore("supplier_details", reset=refresh)
+    suppliers, unlinked = _suppliers(rows)
+    if unlinked:
+        print(f"Skipping {len(unlinked)} suppliers with no detail link in the listing")
+
+    details, to_fetch = {}, {}
+    for url, (company, trading_as, frameworks) in suppliers.items():
+        fingerprint = digest(*sorted(frameworks))
+        cached = cache.lookup(url, fingerprint)
+        if cached is not None:
+            details[url] = cached
+        else:
+            to_fetch[url] = fingerprint
+    print(f"Supplier details: {len(details)} cached, {len(to_fetch)} to fetch")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_fetch_detail, session, url): url for url in to_fetch}
+        for done, future in enumerate(as_completed(futures), 1):
+            url = futures[future]
+            try:
+                details[url] = future.result()
+                cache.remember(url, to_fetch[url], details[url])
+            except Exception as e:
+                print(f"Error fetching {url}: {e}")
+                failed += 1
+            if done % 50 == 0:
+                print(f"Fetched {done}/{len(to_fetch)} supplier pages")
+
+    # Failed suppliers keep their old fingerprint (or none), so they are retried next run
+    cache.save(prune=prune)
+    print(f"Supplier details complete: {len(details)} suppliers, {failed} failed")
+
+    return [
+        {"Company": company, "Trading as": trading_as, "Supplier URL": url,
+         **{column: details[url].get(column, "") for column in DETAIL_COLUMNS[3:]}}
+        for url, (company, trading_as, _) in suppliers.items()
+        if url in details
+    ]
+
+
+def save_supplier_details(details, path=DETAILS_CSV_PATH):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=DETAIL_COLUMNS)
+        writer.writeheader()
+        writer.writerows(details)
+    print(f"Supplier details saved to {path}")
@@ -0,0 +1,116 @@
+"""Sorted export of award records to CSV/Parquet/XLSX.
+
+The records are an in-memory list. No DataFrame (or sorted copy of one) is
+built: the list is sorted as references and streamed to the file in
+fixed-size row groups.
+"""
+import csv
+from datetime import date
+from pathlib import Path
+
+ROW_GROUP_SIZE = 10_000  # rows per write / Parquet row group
+MAX_COLUMN_WIDTH = 50
+
+# Typed up front for Parquet, since a row group may hold only nulls for them
+NUMERIC_COLUMNS = {'Contract_Value'}
+
+
+def award_date_key(record):
+    """Newest Award_Date first; missing or unparseable dates last."""
+    try:
+        return (0, -date.fromisoformat(str(record.get('Award_Date'))[:10]).toordinal())
+    except (TypeError, ValueError):
+        return (1, 0)
+
+
+def _groups(records, size):
+    group = []
+    for record in records:
+        group.append(record)
+        if len(group) == size:
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def _write_csv(path, columns, groups, widths):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for group in groups:
+            writer.writerows(group)
+
+
+def _parquet_type(pa, name, inferred):
+    if name in NUMERIC_COLUMNS:
+        return pa.float64()
+    if pa.types.is_null(inferred):
+        return pa.string()
+    if pa.types.is_integer(inferred):
+        return pa.float64()
+    return inferred
+
+
+def _write_parquet(path, columns, groups, widths):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for group in groups:
+            table = pa.Table.from_pylist(group)
+            if writer is None:
+                # Fix the schema from the first group: all-null columns would be
+                # typed `null`, and amounts may be ints here but floats later
+                schema = pa.schema([pa.field(field.name, _parquet_type(pa, field.name, field.type))
+                                    for field in table.select(columns).schema])
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(pa.Table.from_pylist(group, schema=schema), row_group_size=len(group))
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(path, columns, groups, widths, sheet_name='Award Contracts'):
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    # Write-only sheets need column widths before any rows are appended
+    for i, column in enumerate(columns, 1):
+        ws.column_dimensions[get_column_letter(i)].width = min(widths[column] + 2, MAX_COLUMN_WIDTH)
+    ws.append(columns)
+    for group in groups:
+        for record in group:
+            ws.append([record.get(column) for column in columns])
+    wb.save(path)
+
+
+WRITERS = {".csv": _write_csv, ".parquet": _write_parquet, ".xlsx": _write_xlsx}
+
+
+def write_sorted(records, path, key=award_date_key, row_group_size=ROW_GROUP_SIZE):
+    """Sort `records` (a list of dicts) by `key` and stream them to `path`.
+
+    The format comes from the file extension (.csv, .parquet or .xlsx).
+    Returns per-column counts of non-empty values.
+    """
+    writer = WRITERS.get(Path(path).suffix.lower())
+    if writer is None:
+        raise ValueError(f"Unsupported export format {path!r}, use one of {', '.join(WRITERS)}")
+
+    columns, widths, filled = [], {}, {}
+    for record in records:
+        for column, value in record.items():
+            if column not in widths:
+                columns.append(column)
+                widths[column] = len(column)
+                filled[column] = 0
+            if value is not None and value != "":
+                widths[column] = max(widths[column], len(str(value)))
+                filled[column] += 1
+
+    writer(path, columns, _groups(sorted(records, key=key), row_group_size), widths)
+    return filled
@@ -0,0 +1,84 @@
+"""Content fingerprints from the previous run, used to skip unchanged work.
+
+A store maps a unit key (a supplier's URL or heading, or an OCID + release
+id) to a digest of its content and the rows it produced last time. When the
+digest matches, callers reuse the cached rows instead of parsing again and
+leave the unit out of what gets sent downstream.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from . import config
+
+
+def digest(*parts):
+    """Stable hash of some strings."""
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class FingerprintStore:
+    def __init__(self, name, state_dir=None, reset=False):
+        self.path = Path(state_dir or config.STATE_DIR) / f"{name}_fingerprints.json"
+        self.previous = {} if reset else self._load()
+        self.current = {}
+        self.changed = set()  # keys remembered (rather than matched) this run
+        self.skipped = 0
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError:
+            print(f"Ignoring unreadable fingerprint file {self.path}")
+            return {}
+
+    def lookup(self, key, fingerprint):
+        """Cached rows for `key` if its fingerprint is unchanged, else None."""
+        entry = self.previous.get(key)
+        if entry is None or entry["fingerprint"] != fingerprint:
+            return None
+        self.current[key] = entry
+        self.skipped += 1
+        return entry["rows"]
+
+    def remember(self, key, fingerprint, rows):
+        self.current[key] = {"fingerprint": fingerprint, "rows": rows}
+        self.changed.add(key)
+
+    def forget_changed(self):
+        """Don't record any changed unit, e.g. when nothing was uploaded."""
+        for key in self.changed:
+            self.current.pop(key, None)
+        self.changed.clear()
+
+    def forget_rows(self, rows):
+        """Don't record changed units that produced any of `rows` (matched by identity).
+
+        Used for rows that failed to upload, so they count as changed again
+        on the next run.
+        """
+        ids = {id(row) for row in rows}
+        for key in [k for k in self.changed if any(id(row) in ids for row in self.current[k]["rows"])]:
+            del self.current[key]
+            self.changed.discard(key)
+
+    def save(self, prune=True):
+        """Write this run's fingerprints.
+
+        With `prune`, units not seen this run are dropped; otherwise their
+        previous entries are kept, for runs that only covered some units.
+        """
+        units = self.current if prune else {**self.previous, **self.current}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(units, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
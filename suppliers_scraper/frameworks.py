@@ -0,0 +1,204 @@
+"""Crown Commercial Service supplier search: page counting and parsing."""
+import re
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from . import config
+from .client import get_session
+from .fingerprints import digest
+from .parallel import map_chunks
+
+BASE      = "https://www.crowncommercial.gov.uk"
+LIST_PATH = "/suppliers/search/{page}?search=true&limit=50"
+HEADERS   = {"User-Agent": config.USER_AGENT}
+
+CSV_PATH  = "ccs_suppliers_frameworks.csv"
+XLSX_PATH = "ccs_suppliers_frameworks.xlsx"
+
+PAGE_CHUNK_SIZE = 2  # raw pages per process-pool work unit
+
+
+def page_url(page):
+    return urljoin(BASE, LIST_PATH.format(page=page))
+
+
+def get_max_pages(session):
+    """Method 1: Look for 'X suppliers found' text and calculate pages."""
+    first = session.get(page_url(1), headers=HEADERS, timeout=config.TIMEOUT)
+    first.raise_for_status()
+    soup  = BeautifulSoup(first.text, "html.parser")
+
+    # Look for "2764 suppliers found" text
+    supplier_count_text = soup.get_text()
+    count_match = re.search(r'(\d+)\s+suppliers?\s+found', supplier_count_text, re.IGNORECASE)
+
+    if count_match:
+        total_suppliers = int(count_match.group(1))
+        max_pages = (total_suppliers + 49) // 50  # 50 per page, round up
+        print(f"Method 1: Found {total_suppliers} suppliers, calculating {max_pages} pages")
+        return max_pages
+    else:
+        print("Method 1: Could not find supplier count text")
+        return 1
+
+
+def iter_supplier_blocks(soup):
+    """Yield (heading, url, framework_lines) for each supplier h3 on a page soup."""
+    suppliers = soup.select("h3")
+    for h3 in suppliers:
+        heading = " ".join(h3.get_text(" ").split())
+        # Skip template/placeholder headings
+        if not heading or "{[" in heading or "result.name" in heading:
+            continue
+
+        # Link to the supplier's detail page, if the heading has one
+        link = h3.find("a", href=True) or h3.find_parent("a", href=True)
+        url = urljoin(BASE, link["href"]) if link else ""
+
+        # Find framework lines after this h3
+        framework_lines = []
+        nxt = h3
+        while True:
+            nxt = nxt.find_next_sibling()
+            if not nxt or nxt.name == "h3":
+                break
+            if nxt.name in ("ul", "li", "p"):
+                framework_lines.extend(nxt.get_text("\n").split("\n"))
+
+        yield heading, url, framework_lines
+
+
+def parse_framework_lines(heading, framework_lines, url=""):
+    """Yield dicts, one per framework row, for a single supplier block."""
+    company, trading_as = heading, ""
+    if "Trading as" in heading:
+        parts = heading.split("Trading as", 1)
+        company = parts[0].strip(" .")
+        trading_as = parts[1].strip(" .")
+
+    # Process framework lines
+    for line in framework_lines:
+        line = line.strip(" +•\u2022").replace("\xa0", " ").strip()
+        if not line or "{[" in line or "framework.title" in line:
+            continue
+
+        # Skip lines that are just "Expired" without framework name
+        if line.lower().strip() == "expired":
+            continue
+
+        # Check if this line contains "**Expired**" marker
+        is_expired = "**Expired**" in line
+        # Remove the **Expired** marker to get clean framework name
+        clean_line = re.sub(r'\s*\*\*Expired\*\*\s*', '', line)
+
+        # Try to match "Framework Name (RMxxxx)" pattern
+        # Look for the LAST set of parentheses (most likely to be the reference)
+        parentheses_match = re.search(r'(.+?)\s+\(([^)]+)\)\s*$', clean_line)
+        if parentheses_match:
+            title = parentheses_match.group(1).strip()
+            code = parentheses_match.group(2).strip()
+            yield {
+                "Company": company,
+                "Trading as": trading_as,
+                "Framework / Contract": title,
+                "Reference": code,
+                "Status": "Expired" if is_expired else "Active",
+                "Supplier URL": url,
+            }
+        else:
+            # Handle cases where there's no reference code in parentheses
+            # But still capture the framework name
+            if clean_line and clean_line.lower() != "expired":
+                yield {
+                    "Company": company,
+                    "Trading as": trading_as,
+                    "Framework / Contract": clean_line,
+                    "Reference": "",
+                    "Status": "Expired" if is_expired else "Active",
+                    "Supplier URL": url,
+                }
+
+
+def parse_supplier_blocks(soup):
+    """Yield dicts, one per framework row, from a page soup."""
+    for heading, url, framework_lines in iter_supplier_blocks(soup):
+        yield from parse_framework_lines(heading, framework_lines, url)
+
+
+def page_blocks(html):
+    """Supplier blocks of a raw page as (heading, url, fingerprint, framework_lines)."""
+    soup = BeautifulSoup(html, "html.parser")
+    return [
+        (heading, url, digest(heading, url, *framework_lines), framework_lines)
+        for heading, url, framework_lines in iter_supplier_blocks(soup)
+    ]
+
+
+def parse_page_batch(bodies):
+    """Process-pool worker: page_blocks() for each raw page body."""
+    return [page_blocks(html) for html in bodies]
+
+
+def rows_from_blocks(blocks, fingerprints=None):
+    """Turn supplier blocks into rows, reusing cached rows for unchanged blocks.
+
+    Returns (rows, changed_rows); without a fingerprint store every row counts
+    as changed.
+    """
+    rows, changed = [], []
+    for heading, url, fingerprint, framework_lines in blocks:
+        # Suppliers can share a name, so prefer their detail page URL as the key
+        key = url or heading
+        block_rows = fingerprints.lookup(key, fingerprint) if fingerprints is not None else None
+        if block_rows is None:
+            block_rows = list(parse_framework_lines(heading, framework_lines, url))
+            if fingerprints is not None:
+                fingerprints.remember(key, fingerprint, block_rows)
+            changed.extend(block_rows)
+        rows.extend(block_rows)
+    return rows, changed
+
+
+def scrape_frameworks(session=None, fingerprints=None, workers=None):
+    """Fetch every search page; returns (rows, changed_rows).
+
+    `rows` is the full listing, one row per supplier/framework. With a
+    FingerprintStore, `changed_rows` holds only rows from supplier blocks that
+    differ from the previous run. Raw pages are parsed after fetching, across
+    `workers` processes when more than one is configured.
+
+    Raises if any page fails or comes back without suppliers, so a partial
+    listing is never passed on to history or the fingerprint store.
+    """
+    session   = session or get_session()
+    max_pages = get_max_pages(session)
+    print(f"Detected {max_pages} pages")
+
+    bodies = []
+    for page in range(1, max_pages + 1):
+        resp = session.get(page_url(page), headers=HEADERS, timeout=config.TIMEOUT)
+        resp.raise_for_status()
+        bodies.append(resp.text)
+        print(f"Fetched page {page}/{max_pages}")
+
+    rows, changed = [], []
+    pages = map_chunks(parse_page_batch, bodies, workers=workers, chunk_size=PAGE_CHUNK_SIZE)
+    for page, blocks in enumerate(pages, 1):
+        # A missing page would look like every supplier on it had left
+        if not blocks:
+            raise RuntimeError(f"Page {page}/{max_pages} has no supplier blocks, treating the scrape as incomplete")
+        page_rows, page_changed = rows_from_blocks(blocks, fingerprints)
+        rows.extend(page_rows)
+        changed.extend(page_changed)
+        print(f"Page {page}/{max_pages}: {len(rows)} total rows, {len(changed)} changed")
+
+    if fingerprints is not None:
+        print(f"Skipped {fingerprints.skipped} unchanged supplier blocks")
+    return rows, changed
+
+
+def save_frameworks(df, csv_path=CSV_PATH, xlsx_path=XLSX_PATH):
+    df.to_csv(csv_path,  index=False)
+    df.to_excel(xlsx_path, index=False)
+    print(f"Finished → {csv_path}, {xlsx_path}")
@@ -0,0 +1,153 @@
+"""Append-only history of supplier/framework status changes.
+
+Each scrape is diffed against the last known state (a dict keyed on
+company + reference, so the diff is a single hash join) and only the
+transitions are appended to a JSON-lines event log:
+
+    added           supplier appears on a framework for the first time
+    status_changed  e.g. Active -> Expired
+    removed         supplier no longer listed against the framework
+"""
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+from . import config
+
+EVENTS_FILE = "framework_events.jsonl"
+STATE_FILE  = "framework_status.json"
+
+
+def row_key(row):
+    # Some rows have no RM reference, fall back to the framework title
+    return f"{row['Company']}|{row['Reference'] or row['Framework / Contract']}"
+
+
+def _load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _current_state(rows):
+    """Latest status per key; if a supplier is listed twice, Active wins."""
+    current = {}
+    for row in rows:
+        key = row_key(row)
+        if key in current and current[key]["Status"] == "Active":
+            continue
+        current[key] = row
+    return current
+
+
+def _event(kind, row, status, first_seen, last_seen, run_date, previous_status=None):
+    return {
+        "date": run_date,
+        "event": kind,
+        "company": row["Company"],
+        "reference": row["Reference"],
+        "framework": row["Framework / Contract"],
+        "status": status,
+        "previous_status": previous_status,
+        "first_seen": first_seen,
+        "last_seen": last_seen,
+    }
+
+
+def diff_snapshot(previous, rows, run_date):
+    """Compare a scrape with the previous state; returns (events, new_state)."""
+    current = _current_state(rows)
+    events = []
+    state = {}
+
+    for key, row in current.items():
+        before = previous.get(key)
+        if before is None:
+            events.append(_event("added", row, row["Status"], run_date, run_date, run_date))
+            first_seen = run_date
+        else:
+            first_seen = before["first_seen"]
+            if before["status"] != row["Status"]:
+                events.append(_event("status_changed", row, row["Status"], first_seen, run_date,
+                                     run_date, previous_status=before["status"]))
+        state[key] = {
+            "company": row["Company"],
+            "reference": row["Reference"],
+            "framework": row["Framework / Contract"],
+            "status": row["Status"],
+            "first_seen": first_seen,
+            "last_seen": run_date,
+        }
+
+    for key in previous.keys() - current.keys():
+        before = previous[key]
+        row = {"Company": before["company"], "Reference": before["reference"],
+               "Framework / Contract": before["framework"]}
+        events.append(_event("removed", row, before["status"], before["first_seen"],
+                             before["last_seen"], run_date))
+
+    return events, state
+
+
+def record_snapshot(rows, run_date=None, state_dir=None):
+    """Diff a full scrape against the stored state and append any transitions.
+
+    `rows` must be a complete listing: anything missing is logged as removed.
+    The first run only seeds the state and writes no events.
+    """
+    state_dir = Path(state_dir or config.STATE_DIR)
+    state_dir.mkdir(parents=True, exist_ok=True)
+    run_date = run_date or date.today().isoformat()
+
+    state_path = state_dir / STATE_FILE
+    bootstrap = not state_path.exists()
+    previous = _load_state(state_path)
+    events, state = diff_snapshot(previous, rows, run_date)
+    if bootstrap:
+        # First run: these suppliers weren't "added" today, we just hadn't looked yet
+        print(f"History: seeded state with {len(state)} supplier/framework rows")
+        events = []
+
+    if events:
+        with open(state_dir / EVENTS_FILE, "a", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+    tmp = state_dir / (STATE_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+    os.replace(tmp, state_path)
+
+    if bootstrap:
+        return events
+    counts = {kind: sum(e["event"] == kind for e in events) for kind in ("added", "status_changed", "removed")}
+    print(f"History: {counts['added']} added, {counts['status_changed']} status changes, {counts['removed']} removed")
+    return events
+
+
+def iter_events(reference=None, company=None, event=None, since=None, until=None, state_dir=None):
+    """Stream events from the log, filtered on any of the given fields.
+
+    `since`/`until` are inclusive ISO dates (YYYY-MM-DD).
+    """
+    path = Path(state_dir or config.STATE_DIR) / EVENTS_FILE
+    if not path.exists():
+        return
+    company = company.lower() if company else None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            e = json.loads(line)
+            if reference and e["reference"] != reference:
+                continue
+            if company and company not in e["company"].lower():
+                continue
+            if event and e["event"] != event:
+                continue
+            if since and e["date"] < since:
+                continue
+            if until and e["date"] > until:
+                continue
+            yield e
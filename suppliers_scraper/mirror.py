@@ -0,0 +1,163 @@
+"""Local mirror of an Airtable table, so uploads don't need `table.all()`.
+
+The mirror keeps, per Airtable record id, the record's dedup key and a hash
+of the fields we write. It is refreshed incrementally with a
+LAST_MODIFIED_TIME() filter, so only records edited since the last sync are
+read back. Diffing, dedup and Record ID assignment then run against local
+dicts. Deletions don't show up in that filter, so the whole table is re-read
+every MIRROR_FULL_REFRESH_DAYS.
+"""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from requests import HTTPError
+
+from . import config
+from .fingerprints import digest
+from .ratelimit import get_limiter
+
+AIRTABLE_HOST = "api.airtable.com"
+
+# Allow for clock skew between us and Airtable when filtering on modified time
+REFRESH_OVERLAP = timedelta(minutes=2)
+
+
+def read_all(table, **options):
+    """table.all(), with each page request paced by the api.airtable.com limiter."""
+    limiter = get_limiter(AIRTABLE_HOST)
+    pages = table.iterate(**options)
+    records = []
+    while True:
+        limiter.wait()
+        try:
+            page = next(pages)
+        except StopIteration:
+            return records
+        except HTTPError as e:
+            if e.response is not None:
+                limiter.record(e.response.status_code, e.response.headers.get("Retry-After"))
+            raise
+        limiter.on_success()
+        records.extend(page)
+
+
+def _normalise(value):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return str(value)
+
+
+class AirtableMirror:
+    def __init__(self, table, name, key_fields, value_fields, state_dir=None):
+        self.table = table
+        self.key_fields = key_fields
+        self.value_fields = value_fields
+        self.path = Path(state_dir or config.STATE_DIR) / f"airtable_{name}.json"
+        self.synced_at = None
+        self.full_synced_at = None
+        self.records = {}  # Airtable record id -> {"key", "hash", "record_id"}
+        self.by_key = {}
+        self.max_record_id = 0
+        self._load()
+
+    def key(self, fields):
+        """Dedup key for a record's fields (local or as read from Airtable)."""
+        parts = []
+        for name in self.key_fields:
+            value = fields.get(name)
+            parts.append("; ".join(map(str, value)) if isinstance(value, list) else str(value or ""))
+        return "|".join(parts)
+
+    def field_hash(self, fields):
+        values = {name: _normalise(fields.get(name)) for name in self.value_fields if fields.get(name) not in (None, "", [])}
+        return digest(json.dumps(values, sort_keys=True))
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            synced_at, records = state["synced_at"], state["records"]
+        except FileNotFoundError:
+            return
+        except (json.JSONDecodeError, KeyError, TypeError):
+            # Leaves synced_at unset, so the next refresh does a full read
+            print(f"Ignoring unreadable Airtable mirror {self.path}")
+            return
+        self.synced_at = synced_at
+        self.full_synced_at = state.get("full_synced_at")
+        for record_id, entry in records.items():
+            self._put(record_id, entry)
+
+    def _put(self, airtable_id, entry):
+        old = self.records.get(airtable_id)
+        if old is not None and self.by_key.get(old["key"]) == airtable_id:
+            del self.by_key[old["key"]]
+        self.records[airtable_id] = entry
+        self.by_key[entry["key"]] = airtable_id
+        self.max_record_id = max(self.max_record_id, entry.get("record_id") or 0)
+
+    def forget(self, airtable_id):
+        """Drop a record that no longer exists in Airtable."""
+        entry = self.records.pop(airtable_id, None)
+        if entry is not None and self.by_key.get(entry["key"]) == airtable_id:
+            del self.by_key[entry["key"]]
+
+    def apply(self, records):
+        """Update the mirror from Airtable API records ({"id", "fields"})."""
+        for record in records:
+            fields = record["fields"]
+            try:
+                record_number = int(fields.get("Record ID") or 0)
+            except (TypeError, ValueError):
+                record_number = 0
+            self._put(record["id"], {
+                "key": self.key(fields),
+                "hash": self.field_hash(fields),
+                "record_id": record_number,
+            })
+
+    def _full_refresh_due(self, now):
+        if self.synced_at is None or self.full_synced_at is None:
+            return True
+        age = now - datetime.fromisoformat(self.full_synced_at)
+        return age >= timedelta(days=config.MIRROR_FULL_REFRESH_DAYS)
+
+    def refresh(self, full=False):
+        """Pull records changed since the last sync (or everything if `full` or due)."""
+        started = datetime.now(timezone.utc)
+        if full or self._full_refresh_due(started):
+            records = read_all(self.table)
+            self.records, self.by_key, self.max_record_id = {}, {}, 0
+            self.full_synced_at = started.isoformat()
+            print(f"Mirror: full read of {len(records)} Airtable records")
+        else:
+            since = datetime.fromisoformat(self.synced_at) - REFRESH_OVERLAP
+            formula = f"IS_AFTER(LAST_MODIFIED_TIME(), DATETIME_PARSE('{since.strftime('%Y-%m-%dT%H:%M:%SZ')}'))"
+            records = read_all(self.table, formula=formula)
+            print(f"Mirror: {len(records)} Airtable records changed since {self.synced_at}")
+        self.apply(records)
+        self.synced_at = started.isoformat()
+
+    def lookup(self, fields):
+        """(airtable id, unchanged?) for local fields, or (None, False) if new."""
+        airtable_id = self.by_key.get(self.key(fields))
+        if airtable_id is None:
+            return None, False
+        return airtable_id, self.records[airtable_id]["hash"] == self.field_hash(fields)
+
+    def next_record_id(self):
+        return self.max_record_id + 1
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"synced_at": self.synced_at, "full_synced_at": self.full_synced_at,
+                       "records": self.records}, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
@@ -0,0 +1,32 @@
+"""Chunked, order-preserving fan-out of CPU-bound parsing to a process pool."""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from . import config
+
+
+def resolve_workers(workers=None):
+    """None -> SCRAPER_WORKERS, 0 -> one per CPU core."""
+    workers = config.WORKERS if workers is None else workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def map_chunks(func, items, workers=None, chunk_size=100):
+    """Yield func's results for successive chunks of items, in input order.
+
+    `func` must be a module-level function taking a list and returning a
+    list, so it can be pickled to worker processes. With one worker (the
+    default) everything runs in-process and no pool is started.
+    """
+    workers = resolve_workers(workers)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            yield from func(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        # map() hands back results in submission order, so merging stays ordered
+        for result in pool.map(func, chunks):
+            yield from result
@@ -0,0 +1,86 @@
+"""Per-host adaptive (AIMD) rate limiting driven by server responses.
+
+Each host starts at its configured rate and speeds up a little after every
+healthy response (additive increase). A 429/503 halves the rate
+(multiplicative decrease), and a Retry-After header pauses the host for as
+long as the server asks.
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+
+from . import config
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:  # a "-0000" zone parses as naive, but HTTP dates are UTC
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveLimiter:
+    def __init__(self, rate, min_rate, max_rate, increase=0.1, decrease=0.5):
+        self.rate = rate  # requests per second
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this host's next request slot."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + 1 / self.rate
+        if slot > now:
+            time.sleep(slot - now)
+
+    def on_success(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after=None):
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after:
+                self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+        print(f"Throttled, slowing to {self.rate:.2f} req/s"
+              + (f" and pausing {retry_after:.1f}s" if retry_after else ""))
+
+    def record(self, status_code, retry_after=None):
+        """Feed a response status back; returns True if it was a throttle."""
+        if status_code in THROTTLE_STATUSES:
+            self.on_throttle(parse_retry_after(retry_after))
+            return True
+        if status_code < 500:
+            self.on_success()
+        return False
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(host):
+    """Shared limiter for a host, created from config.HOST_RATE_LIMITS."""
+    with _limiters_lock:
+        if host not in _limiters:
+            rate, min_rate, max_rate = config.HOST_RATE_LIMITS.get(host, config.DEFAULT_RATE_LIMIT)
+            _limiters[host] = AdaptiveLimiter(rate, min_rate, max_rate)
+        return _limiters[host]
@@ -0,0 +1,207 @@
+"""Local SQLite index over scraped suppliers, frameworks and awards.
+
+Full-text search (FTS5) covers supplier names and award titles, descriptions
+and suppliers. B-tree indexes cover framework reference, CPV code, award date
+and contract value, so a question like "suppliers on RM6263 that won IT
+awards over £1m" is one indexed query instead of a trawl through XLSX files or
+Airtable.
+"""
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from . import config
+
+INDEX_FILE = "search.sqlite"
+
+SCHEMA = """
+CREATE TABLE suppliers (
+    id INTEGER PRIMARY KEY,
+    company TEXT NOT NULL,
+    trading_as TEXT,
+    framework TEXT,
+    reference TEXT,
+    status TEXT
+);
+CREATE INDEX suppliers_reference ON suppliers (reference);
+CREATE INDEX suppliers_company ON suppliers (company COLLATE NOCASE);
+CREATE INDEX suppliers_trading_as ON suppliers (trading_as COLLATE NOCASE);
+
+CREATE TABLE awards (
+    id INTEGER PRIMARY KEY,
+    ocid TEXT,
+    release_id TEXT,
+    release_date TEXT,
+    title TEXT,
+    description TEXT,
+    buyer_name TEXT,
+    award_date TEXT,
+    supplier_name TEXT,
+    contract_value REAL,
+    currency TEXT,
+    contract_start_date TEXT,
+    contract_end_date TEXT,
+    award_status TEXT,
+    cpv_codes TEXT,
+    cpv_descriptions TEXT,
+    notice_url TEXT
+);
+CREATE INDEX awards_award_date ON awards (award_date);
+CREATE INDEX awards_contract_value ON awards (contract_value);
+
+-- One row per CPV code / supplier of an award, for indexed lookups and joins
+CREATE TABLE award_cpv (award_id INTEGER NOT NULL, cpv_code TEXT NOT NULL);
+CREATE INDEX award_cpv_code ON award_cpv (cpv_code, award_id);
+CREATE TABLE award_suppliers (award_id INTEGER NOT NULL, supplier TEXT NOT NULL);
+CREATE INDEX award_suppliers_supplier ON award_suppliers (supplier COLLATE NOCASE, award_id);
+
+CREATE VIRTUAL TABLE suppliers_fts USING fts5(
+    company, trading_as, framework, content='suppliers', content_rowid='id'
+);
+CREATE VIRTUAL TABLE awards_fts USING fts5(
+    title, description, supplier_name, buyer_name, content='awards', content_rowid='id'
+);
+"""
+
+AWARD_FIELDS = [
+    'OCID', 'Release_ID', 'Release_Date', 'Title', 'Description', 'Buyer_Name',
+    'Award_Date', 'Supplier_Name', 'Contract_Value', 'Currency',
+    'Contract_Start_Date', 'Contract_End_Date', 'Award_Status',
+    'CPV_Codes', 'CPV_Descriptions', 'Notice_URL',
+]
+
+
+def plain_terms(text):
+    """FTS5 query matching every word of `text`, with no query syntax.
+
+    Each word is quoted, so input like "service-desk" or "IT, cloud" can't
+    be read as FTS5 operators or column filters.
+    """
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+def index_path(path=None):
+    return Path(path or Path(config.STATE_DIR) / INDEX_FILE)
+
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(";") if part.strip()]
+
+
+def build_index(framework_rows, award_records, path=None):
+    """Rebuild the index from scratch; written to a temp file then swapped in."""
+    path = index_path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany(
+                "INSERT INTO suppliers (company, trading_as, framework, reference, status) VALUES (?, ?, ?, ?, ?)",
+                ((r["Company"], r["Trading as"], r["Framework / Contract"], r["Reference"], r["Status"])
+                 for r in framework_rows),
+            )
+
+            placeholders = ", ".join("?" * len(AWARD_FIELDS))
+            columns = ", ".join(field.lower() for field in AWARD_FIELDS)
+            for record in award_records:
+                award_id = conn.execute(
+                    f"INSERT INTO awards ({columns}) VALUES ({placeholders})",
+                    [record.get(field) for field in AWARD_FIELDS],
+                ).lastrowid
+                conn.executemany("INSERT INTO award_cpv VALUES (?, ?)",
+                                 ((award_id, code) for code in _split(record.get('CPV_Codes'))))
+                conn.executemany("INSERT INTO award_suppliers VALUES (?, ?)",
+                                 ((award_id, name) for name in _split(record.get('Supplier_Name'))))
+
+            conn.execute("INSERT INTO suppliers_fts (suppliers_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO awards_fts (awards_fts) VALUES ('rebuild')")
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+
+    tmp.replace(path)
+    print(f"Indexed {len(framework_rows)} supplier rows and {len(award_records)} awards → {path}")
+
+
+def connect(path=None):
+    path = index_path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"No search index at {path}, run `suppliers-scraper index` first")
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def search_suppliers(text=None, reference=None, status=None, limit=50, path=None):
+    """Supplier/framework rows matching a full-text query and/or filters."""
+    sql = ["SELECT s.* FROM suppliers s"]
+    where, params = [], []
+    if text:
+        sql.append("JOIN suppliers_fts f ON f.rowid = s.id")
+        where.append("suppliers_fts MATCH ?")
+        params.append(text)
+    if reference:
+        where.append("s.reference = ?")
+        params.append(reference)
+    if status:
+        where.append("s.status = ?")
+        params.append(status)
+    if where:
+        sql.append("WHERE " + " AND ".join(where))
+    sql.append("ORDER BY s.company LIMIT ?")
+    params.append(limit)
+
+    with closing(connect(path)) as conn:
+        return [dict(row) for row in conn.execute(" ".join(sql), params)]
+
+
+def search_awards(text=None, reference=None, cpv_prefixes=None, min_value=None, max_value=None,
+                  since=None, until=None, limit=50, path=None):
+    """Awards matching a full-text query and/or filters, newest first.
+
+    `reference` keeps awards won by a supplier (company or trading name) on
+    that framework. `cpv_prefixes` matches CPV codes by prefix, e.g. ["72",
+    "48"] for IT. `since`/`until` bound the award date (YYYY-MM-DD).
+    """
+    # Placeholders are bound in SQL order, so JOIN and WHERE parameters are
+    # collected separately and joined up at the end
+    sql = ["SELECT DISTINCT a.* FROM awards a"]
+    join_params, where, where_params = [], [], []
+    if text:
+        sql.append("JOIN awards_fts f ON f.rowid = a.id")
+        where.append("awards_fts MATCH ?")
+        where_params.append(text)
+    if cpv_prefixes:
+        ranges = " OR ".join("c.cpv_code BETWEEN ? AND ?" for _ in cpv_prefixes)
+        sql.append(f"JOIN award_cpv c ON c.award_id = a.id AND ({ranges})")
+        for prefix in cpv_prefixes:
+            join_params.extend([prefix, prefix + "~"])  # '~' sorts after every digit
+    if reference:
+        sql.append("JOIN award_suppliers w ON w.award_id = a.id")
+        where.append("""EXISTS (
+            SELECT 1 FROM suppliers s WHERE s.reference = ?
+            AND (s.company = w.supplier COLLATE NOCASE OR s.trading_as = w.supplier COLLATE NOCASE))""")
+        where_params.append(reference)
+    if min_value is not None:
+        where.append("a.contract_value >= ?")
+        where_params.append(min_value)
+    if max_value is not None:
+        where.append("a.contract_value <= ?")
+        where_params.append(max_value)
+    if since:
+        where.append("a.award_date >= ?")
+        where_params.append(since)
+    if until:
+        where.append("a.award_date <= ?")
+        where_params.append(until)
+    if where:
+        sql.append("WHERE " + " AND ".join(where))
+    sql.append("ORDER BY a.award_date DESC LIMIT ?")
+    params = join_params + where_params + [limit]
+
+    with closing(connect(path)) as conn:
+        return [dict(row) for row in conn.execute(" ".join(sql), params)]
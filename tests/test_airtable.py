@@ -0,0 +1,150 @@
+import itertools
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from requests import HTTPError, Response
+
+from suppliers_scraper.airtable import frameworks_mirror, sync_records
+from suppliers_scraper.ratelimit import AdaptiveLimiter
+
+
+class FakeTable:
+    """Just enough of pyairtable's Table for the mirror and sync_records."""
+
+    def __init__(self):
+        self.records = {}
+        self.ids = (f"rec{n}" for n in itertools.count(1))
+        self.modified = set()
+        self.full_reads = 0
+        self.calls = []
+
+    def _error(self, status):
+        response = Response()
+        response.status_code = status
+        return HTTPError(f"{status} error", response=response)
+
+    def _record(self, airtable_id):
+        return {"id": airtable_id, "fields": dict(self.records[airtable_id])}
+
+    def iterate(self, formula=None):
+        if formula is None:
+            self.full_reads += 1
+            yield [self._record(i) for i in self.records]
+        else:
+            yield [self._record(i) for i in self.records if i in self.modified]
+
+    def get(self, airtable_id):
+        if airtable_id not in self.records:
+            raise self._error(404)
+        return self._record(airtable_id)
+
+    def batch_create(self, records, typecast=False):
+        self.calls.append(("create", len(records)))
+        created = []
+        for fields in records:
+            airtable_id = next(self.ids)
+            self.records[airtable_id] = dict(fields)
+            created.append(self._record(airtable_id))
+        return created
+
+    def batch_update(self, records, typecast=False):
+        self.calls.append(("update", len(records)))
+        if any(record["id"] not in self.records for record in records):
+            raise self._error(422)
+        return [self.update(record["id"], record["fields"]) for record in records]
+
+    def update(self, airtable_id, fields, typecast=False):
+        if airtable_id not in self.records:
+            raise self._error(404)
+        self.records[airtable_id].update(fields)
+        return self._record(airtable_id)
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(AdaptiveLimiter, "wait", lambda self: None)
+    monkeypatch.setattr("suppliers_scraper.config.STATE_DIR", str(tmp_path))
+
+
+def row(company, reference="RM1", status="Active"):
+    return {"Company": company, "Framework / Contract": f"Framework {reference}",
+            "Reference": reference, "Status": status, "Trading as": ""}
+
+
+def sync(table, rows, **kwargs):
+    mirror = frameworks_mirror(table)
+    failed = []
+    result = sync_records(table, mirror, rows, failed_indices=failed, assign_record_ids=True, **kwargs)
+    return result, failed
+
+
+def by_company(table):
+    return {fields["Company"]: fields for fields in table.records.values()}
+
+
+def test_creates_updates_and_skips():
+    table = FakeTable()
+    assert sync(table, [row("Acme"), row("Beta"), row("Acme")]) == ((2, 0), [])
+    assert [fields["Record ID"] for fields in by_company(table).values()] == [1, 2]
+
+    table.calls.clear()
+    result = sync(table, [row("Acme"), row("Beta", status="Expired"), row("Gamma")])
+    assert result == ((2, 0), [])
+    assert table.calls == [("update", 1), ("create", 1)]
+    assert by_company(table)["Beta"]["Status"] == "Expired"
+    assert by_company(table)["Gamma"]["Record ID"] == 3
+
+
+def test_record_ids_continue_from_airtable_edits():
+    table = FakeTable()
+    sync(table, [row("Acme")])
+    table.records["rec1"]["Record ID"] = 41
+    table.modified.add("rec1")
+
+    sync(table, [row("Beta")])
+    assert by_company(table)["Beta"]["Record ID"] == 42
+
+
+def test_failed_indices_map_back_to_every_duplicate(monkeypatch):
+    table = FakeTable()
+
+    def reject(records, typecast=False):
+        raise HTTPError("500 error")
+    monkeypatch.setattr(table, "batch_create", reject)
+
+    result = sync(table, [row("Acme"), row("Beta"), row("Acme")])
+    assert result == ((0, 2), [0, 2, 1])
+
+
+def test_deleted_record_is_recreated_without_failing_its_batch():
+    table = FakeTable()
+    sync(table, [row(f"Supplier {n}") for n in range(10)])
+    del table.records["rec4"]  # deleted in Airtable, still in the mirror
+
+    result = sync(table, [row(f"Supplier {n}", status="Expired") for n in range(10)])
+    assert result == ((10, 0), [])
+    assert len(table.records) == 10
+    assert all(fields["Status"] == "Expired" for fields in table.records.values())
+    assert by_company(table)["Supplier 3"]["Record ID"] == 11
+
+    # The mirror now points at the new record, so the next run has nothing to do
+    table.calls.clear()
+    assert sync(table, [row(f"Supplier {n}", status="Expired") for n in range(10)]) == ((0, 0), [])
+    assert table.calls == []
+
+
+def test_full_refresh_when_last_one_is_too_old():
+    table = FakeTable()
+    sync(table, [row("Acme")])
+    sync(table, [row("Acme")])
+    assert table.full_reads == 1
+
+    # A record deleted in Airtable with unchanged fields is only noticed by a full read
+    del table.records["rec1"]
+    mirror = frameworks_mirror(table)
+    mirror.full_synced_at = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+    mirror.save()
+
+    assert sync(table, [row("Acme")]) == ((1, 0), [])
+    assert table.full_reads == 2
+    assert list(by_company(table)) == ["Acme"]
@@ -0,0 +1,25 @@
+from suppliers_scraper.awards import process_releases
+from suppliers_scraper.fingerprints import FingerprintStore
+
+
+def release(n, date="2026-01-01T00:00:00Z"):
+    return {"ocid": f"ocds-{n}", "id": f"r{n}", "date": date,
+            "tender": {"title": f"Tender {n}", "classification": {"scheme": "CPV", "id": "72000000"}}}
+
+
+def titles(records):
+    return [record["Title"] for record in records]
+
+
+def test_process_releases_keeps_input_order_with_cached_releases(tmp_path):
+    releases = [release(n) for n in range(6)]
+    first = FingerprintStore("awards", state_dir=tmp_path)
+    process_releases(releases[::2], first)
+    first.save()
+
+    # Releases 0, 2 and 4 come from the cache, 3 changed, 1 and 5 are new
+    releases[3] = release(3, date="2026-02-01T00:00:00Z")
+    filtered, changed = process_releases(releases, FingerprintStore("awards", state_dir=tmp_path))
+
+    assert titles(filtered) == [f"Tender {n}" for n in range(6)]
+    assert titles(changed) == ["Tender 1", "Tender 3", "Tender 5"]
@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import pytest
+
+from suppliers_scraper.enrich import enrich_suppliers, parse_supplier_detail
+
+SAMPLE_PAGE = (Path(__file__).parent / "fixtures" / "ccs_supplier_detail.html").read_text(encoding="utf-8")
+
+
+class FakeResponse:
+    text = SAMPLE_PAGE
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self):
+        self.fetched = []
+
+    def get(self, url, timeout=None):
+        self.fetched.append(url)
+        return FakeResponse()
+
+
+def row(company, reference="RM6263"):
+    return {"Company": company, "Trading as": "", "Reference": reference,
+            "Framework / Contract": f"Framework {reference}",
+            "Supplier URL": f"https://example.test/{company}" if company else ""}
+
+
+@pytest.fixture(autouse=True)
+def state_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr("suppliers_scraper.config.STATE_DIR", str(tmp_path))
+
+
+def test_parse_sample_supplier_page():
+    assert parse_supplier_detail(SAMPLE_PAGE) == {
+        "Contact": "Jane Smith",
+        "Email": "bids@acme-cloud.example",
+        "Phone": "020 7946 0000",
+        "Address": "1 Example Street, London, SW1A 1AA",
+        "Company number": "01234567",
+        "Lots": "Lot 1: Technology Strategy and Service Design; Lot 3: Operational Services; "
+                "Lot 2a: Inter Site Connectivity",
+    }
+
+
+def test_pages_are_fetched_again_only_when_frameworks_change():
+    session = FakeSession()
+    details = enrich_suppliers([row("a"), row("b"), row("b", "RM6116")], session=session, workers=2)
+    assert [d["Company"] for d in details] == ["a", "b"]
+    assert details[0]["Company number"] == "01234567"
+    assert len(session.fetched) == 2
+
+    session = FakeSession()
+    enrich_suppliers([row("a"), row("b")], session=session)
+    assert session.fetched == ["https://example.test/b"]
+
+
+def test_partial_runs_keep_the_cache_and_full_runs_prune_it():
+    enrich_suppliers([row("a"), row("b")], session=FakeSession())
+
+    enrich_suppliers([row("a")], session=FakeSession())
+    session = FakeSession()
+    enrich_suppliers([row("a"), row("b")], session=session)
+    assert session.fetched == []
+
+    enrich_suppliers([row("a")], session=FakeSession(), prune=True)
+    session = FakeSession()
+    enrich_suppliers([row("a"), row("b")], session=session)
+    assert session.fetched == ["https://example.test/b"]
+
+
+def test_rows_without_supplier_urls(capsys):
+    details = enrich_suppliers([row("a"), row("")], session=FakeSession())
+    assert len(details) == 1
+    assert "Skipping 1 suppliers with no detail link" in capsys.readouterr().out
+
+    legacy = {key: value for key, value in row("a").items() if key != "Supplier URL"}
+    with pytest.raises(ValueError, match="scrape-frameworks"):
+        enrich_suppliers([legacy], session=FakeSession())
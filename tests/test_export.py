@@ -0,0 +1,38 @@
+import csv
+
+import pytest
+
+from suppliers_scraper.export import write_sorted
+
+RECORDS = [
+    {"Award_Date": "2026-01-01", "Contract_Value": None, "Title": "a"},
+    {"Award_Date": None, "Contract_Value": 3, "Title": "b"},
+    {"Award_Date": "2026-03-01", "Contract_Value": None, "Title": "c"},
+    {"Award_Date": "not a date", "Contract_Value": 12.5, "Title": ""},
+    {"Award_Date": "2026-02-01T10:00:00", "Contract_Value": None, "Title": "e"},
+]
+
+
+def test_csv_is_sorted_newest_first_with_undated_last(tmp_path):
+    path = tmp_path / "awards.csv"
+    filled = write_sorted(RECORDS, path, row_group_size=2)
+
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["Title"] for row in rows] == ["c", "e", "a", "b", ""]
+    assert filled == {"Award_Date": 4, "Contract_Value": 2, "Title": 4}
+
+
+def test_parquet_types_contract_value_when_first_group_is_null(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = tmp_path / "awards.parquet"
+    write_sorted(RECORDS, path, row_group_size=2)
+
+    table = pq.read_table(path)
+    assert str(table.schema.field("Contract_Value").type) == "double"
+    assert table.column("Contract_Value").to_pylist() == [None, None, None, 3.0, 12.5]
+
+
+def test_unsupported_format(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported export format"):
+        write_sorted(RECORDS, tmp_path / "awards.json")
@@ -0,0 +1,59 @@
+from suppliers_scraper.fingerprints import FingerprintStore, digest
+
+
+def seeded_store(tmp_path):
+    store = FingerprintStore("test", state_dir=tmp_path)
+    store.remember("a", digest("a1"), [{"row": "a"}])
+    store.remember("b", digest("b1"), [{"row": "b"}])
+    store.save()
+    return FingerprintStore("test", state_dir=tmp_path)
+
+
+def test_lookup_reuses_rows_only_for_matching_fingerprint(tmp_path):
+    store = seeded_store(tmp_path)
+
+    assert store.lookup("a", digest("a1")) == [{"row": "a"}]
+    assert store.lookup("b", digest("b2")) is None
+    assert store.lookup("c", digest("c1")) is None
+    assert store.skipped == 1
+    assert store.changed == set()
+
+
+def test_save_keeps_seen_units_and_drops_unseen(tmp_path):
+    store = seeded_store(tmp_path)
+    store.lookup("a", digest("a1"))
+    store.remember("c", digest("c1"), [{"row": "c"}])
+    store.save()
+
+    assert set(FingerprintStore("test", state_dir=tmp_path).previous) == {"a", "c"}
+
+
+def test_forget_changed_keeps_only_matched_units(tmp_path):
+    store = seeded_store(tmp_path)
+    store.lookup("a", digest("a1"))
+    store.remember("b", digest("b2"), [{"row": "b2"}])
+    store.forget_changed()
+    store.save()
+
+    assert set(FingerprintStore("test", state_dir=tmp_path).previous) == {"a"}
+
+
+def test_forget_rows_drops_units_that_produced_failed_rows(tmp_path):
+    store = FingerprintStore("test", state_dir=tmp_path)
+    ok, failed = {"row": "ok"}, {"row": "failed"}
+    store.remember("ok", digest("ok"), [ok])
+    store.remember("mixed", digest("mixed"), [dict(ok), failed])
+    # An equal row from another unit must not count, rows are matched by identity
+    store.remember("equal", digest("equal"), [{"row": "failed"}])
+    store.forget_rows([failed])
+    store.save()
+
+    assert set(FingerprintStore("test", state_dir=tmp_path).previous) == {"ok", "equal"}
+
+
+def test_reset_and_unreadable_file_start_empty(tmp_path):
+    seeded_store(tmp_path)
+    assert FingerprintStore("test", state_dir=tmp_path, reset=True).previous == {}
+
+    (tmp_path / "test_fingerprints.json").write_text("{not json", encoding="utf-8")
+    assert FingerprintStore("test", state_dir=tmp_path).previous == {}
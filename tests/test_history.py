@@ -0,0 +1,43 @@
+import json
+
+from suppliers_scraper.history import EVENTS_FILE, diff_snapshot, iter_events, record_snapshot
+
+
+def row(company, reference, status="Active"):
+    return {"Company": company, "Reference": reference, "Framework / Contract": f"Framework {reference}",
+            "Status": status}
+
+
+def test_diff_snapshot_reports_each_transition():
+    _, previous = diff_snapshot({}, [row("Acme", "RM1"), row("Beta", "RM1")], "2026-01-01")
+    events, state = diff_snapshot(previous, [row("Acme", "RM1", "Expired"), row("Gamma", "RM2")], "2026-02-01")
+
+    assert sorted((e["event"], e["company"]) for e in events) == [
+        ("added", "Gamma"), ("removed", "Beta"), ("status_changed", "Acme"),
+    ]
+    changed = next(e for e in events if e["event"] == "status_changed")
+    assert (changed["previous_status"], changed["status"]) == ("Active", "Expired")
+    assert state["Acme|RM1"]["first_seen"] == "2026-01-01"
+    assert state["Acme|RM1"]["last_seen"] == "2026-02-01"
+    assert "Beta|RM1" not in state
+
+
+def test_active_listing_wins_over_expired_duplicate():
+    events, state = diff_snapshot({}, [row("Acme", "RM1"), row("Acme", "RM1", "Expired")], "2026-01-01")
+
+    assert len(events) == 1
+    assert state["Acme|RM1"]["status"] == "Active"
+
+
+def test_first_run_seeds_state_without_events(tmp_path):
+    assert record_snapshot([row("Acme", "RM1")], run_date="2026-01-01", state_dir=tmp_path) == []
+    assert not (tmp_path / EVENTS_FILE).exists()
+
+    events = record_snapshot([row("Acme", "RM1", "Expired")], run_date="2026-01-02", state_dir=tmp_path)
+    assert [e["event"] for e in events] == ["status_changed"]
+
+    record_snapshot([], run_date="2026-01-03", state_dir=tmp_path)
+    logged = [json.loads(line) for line in (tmp_path / EVENTS_FILE).read_text(encoding="utf-8").splitlines()]
+    assert [(e["date"], e["event"]) for e in logged] == [("2026-01-02", "status_changed"), ("2026-01-03", "removed")]
+    assert [e["event"] for e in iter_events(event="removed", state_dir=tmp_path)] == ["removed"]
+    assert [e["date"] for e in iter_events(since="2026-01-03", state_dir=tmp_path)] == ["2026-01-03"]
@@ -0,0 +1,19 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from suppliers_scraper.ratelimit import parse_retry_after
+
+
+def test_parse_retry_after_seconds_and_garbage():
+    assert parse_retry_after("30") == 30.0
+    assert parse_retry_after("-5") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_parse_retry_after_http_dates():
+    later = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(seconds=60)
+    assert 50 < parse_retry_after(format_datetime(later, usegmt=True)) <= 60
+    # "-0000" parses to a naive datetime
+    assert 50 < parse_retry_after(later.strftime("%a, %d %b %Y %H:%M:%S -0000")) <= 60
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 -0000") == 0.0
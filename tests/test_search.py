@@ -0,0 +1,74 @@
+import pytest
+
+from suppliers_scraper.cli import main
+from suppliers_scraper.search import build_index, plain_terms, search_awards, search_suppliers
+
+FRAMEWORK_ROWS = [
+    {"Company": "Acme Ltd", "Trading as": "Acme Cloud", "Framework / Contract": "Technology Services 3",
+     "Reference": "RM6263", "Status": "Active"},
+    {"Company": "Beta plc", "Trading as": "", "Framework / Contract": "Facilities Management",
+     "Reference": "RM3830", "Status": "Expired"},
+]
+
+AWARD_RECORDS = [
+    {"OCID": "ocds-1", "Title": "Cloud hosting", "Description": "Managed cloud hosting",
+     "Award_Date": "2026-05-01", "Supplier_Name": "ACME CLOUD; Zeta Ltd", "Contract_Value": 2_000_000,
+     "Currency": "GBP", "CPV_Codes": "72000000; 48000000"},
+    {"OCID": "ocds-2", "Title": "Cloud desk cleaning", "Description": "Cleaning of cloud team offices",
+     "Award_Date": "2026-06-01", "Supplier_Name": "Beta plc", "Contract_Value": 5_000_000,
+     "Currency": "GBP", "CPV_Codes": "90910000"},
+    {"OCID": "ocds-3", "Title": "Service desk", "Description": "IT service desk",
+     "Award_Date": "2026-06-15", "Supplier_Name": "Acme Ltd", "Contract_Value": 5_000,
+     "Currency": "GBP", "CPV_Codes": "72100000"},
+]
+
+
+def make_index(tmp_path):
+    path = tmp_path / "search.sqlite"
+    build_index(FRAMEWORK_ROWS, AWARD_RECORDS, path=path)
+    return path
+
+
+def ocids(rows):
+    return [row["ocid"] for row in rows]
+
+
+def test_text_and_cpv_filters_combine(tmp_path):
+    path = make_index(tmp_path)
+
+    assert ocids(search_awards(text="cloud", path=path)) == ["ocds-2", "ocds-1"]
+    assert ocids(search_awards(cpv_prefixes=["72"], path=path)) == ["ocds-3", "ocds-1"]
+    assert ocids(search_awards(text="cloud", cpv_prefixes=["72"], path=path)) == ["ocds-1"]
+
+
+def test_all_award_filters_combine(tmp_path):
+    path = make_index(tmp_path)
+
+    rows = search_awards(text="cloud", reference="RM6263", cpv_prefixes=["72", "48"],
+                         min_value=1_000_000, since="2026-01-01", until="2026-12-31", path=path)
+    assert ocids(rows) == ["ocds-1"]
+
+
+def test_search_suppliers(tmp_path):
+    path = make_index(tmp_path)
+
+    assert [r["company"] for r in search_suppliers(text="acme", path=path)] == ["Acme Ltd"]
+    assert [r["company"] for r in search_suppliers(status="Expired", path=path)] == ["Beta plc"]
+
+
+def test_plain_terms_match_words_with_punctuation(tmp_path):
+    path = make_index(tmp_path)
+
+    assert ocids(search_awards(text=plain_terms("service-desk"), path=path)) == ["ocds-3"]
+    assert ocids(search_awards(text=plain_terms('IT, "service'), path=path)) == ["ocds-3"]
+    assert ocids(search_awards(text=plain_terms("cloud hosting"), path=path)) == ["ocds-1"]
+
+
+def test_cli_reports_invalid_fts_query(tmp_path, monkeypatch, capsys):
+    make_index(tmp_path)
+    monkeypatch.setattr("suppliers_scraper.config.STATE_DIR", str(tmp_path))
+
+    main(["search", "awards", "--text", "IT, cloud"])
+    assert "0 results" in capsys.readouterr().out
+    with pytest.raises(SystemExit, match="drop --fts"):
+        main(["search", "awards", "--fts", "--text", "IT, cloud"])